@@ -13,30 +13,44 @@
 #-------------------------------------------------------------------------------
 
 import arcpy
+import numpy as np
 import random
 import os
+import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Write a whole attribute column back onto a feature class in one join keyed on
+# the object IDs, instead of walking the rows with an UpdateCursor
+def bulk_update_field(feature_class, oids, values, field_name):
+    value_arr = np.rec.fromarrays([oids, values], names=["OID_", field_name])
+    arcpy.da.ExtendTable(feature_class, "OID@", value_arr, "OID_")
+
+
+# Move a shapefile and all of its sidecar files (.shx, .dbf, .prj, ...) into
+# another folder. arcpy.management.Rename only renames a dataset within its
+# own workspace, so getting the SplitByAttributes outputs out of their temp
+# folder needs an actual file move
+def move_shapefile(src_shp, dst_shp):
+    src_folder = os.path.dirname(src_shp)
+    src_name = os.path.splitext(os.path.basename(src_shp))[0]
+    dst_base = os.path.splitext(dst_shp)[0]
+    for sidecar in os.listdir(src_folder):
+        sidecar_name, ext = os.path.splitext(sidecar)
+        if sidecar_name == src_name:
+            shutil.move(os.path.join(src_folder, sidecar), dst_base + ext)
 
 
 # Set up folders for the files
 # After setting up the folders, you will need to save the shapefiles for the linear feautres, wellpads, ecosites and systematic grid into the 'Source Files' folder
 def setup_folders(root_folder):
 
-    try:
-        os.makedirs(root_folder)
-        print("Folder %s created" % root_folder)
-
-    except FileExistsError:
-        print("Folder %s already exists" % root_folder)
+    os.makedirs(root_folder, exist_ok=True)
 
-    try:
-        folder_list = ['Source_files', 'Working_Files']
-        for folder in folder_list:
-            path = os.path.join(root_folder, folder)
-            os.mkdir(path)
-
-    except FileExistsError:
-        print("Folders already exist")
+    folder_list = ['Source_files', 'Working_Files']
+    for folder in folder_list:
+        os.makedirs(os.path.join(root_folder, folder), exist_ok=True)
 
     print('Save your lines, wellpads, systematic grid and ecosites in the source files folder before moving to the next step.')
 
@@ -52,39 +66,18 @@ def get_orientation(input_line_shapefile):
     print ('Bearing and length added')
     print ('Getting directions...')
 
-    # Create a field to hold the direction
-    arcpy.management.AddField(line_shapefile, "direction", "TEXT", field_length=50)
-
-    # Get the direction based on bearing
-    fields = ["SHAPE@", "bearing", "length", "direction"]
-    with arcpy.da.UpdateCursor(line_shapefile, fields) as cursor:
-        for row in cursor:
-            bearing = row[1]
-
-            # Define directions.
-            # You can adjust these to meet narrower criteria as needed.
-            # Note that N-S needs three entries to cover the ranges because it wraps past 360 degrees
-            direction_ranges = {
-                (0, 22.5): "N_S",
-                (157.5, 202.5): "N_S",
-                (337.5, 360): "N_S",
-                (67.5, 112.5): "E_W",
-                (247.5, 292.5): "E_W",
-                (22.5, 67.5):   "SW_NE",
-                (202.5, 247.5): "SW_NE",
-                (112.5, 157.5): "NW_SE",
-                (292.5, 337.5): "NW_SE",
-            }
-
-            # Check which range the bearing falls into
-            for range, direction in direction_ranges.items():
-                if range[0] <= bearing <= range[1]:
-                    row[3] = direction
-                    break
-            else:
-                row[3] = "Unknown"
+    # Read all of the bearings at once and bin them against the direction boundaries
+    # in a single pass rather than testing every row against a dict of ranges.
+    # You can adjust these edges to meet narrower criteria as needed.
+    # Note that N_S appears at both ends of the labels because it wraps past 360 degrees
+    arr = arcpy.da.FeatureClassToNumPyArray(line_shapefile, ["OID@", "bearing"])
+    edges = np.array([22.5, 67.5, 112.5, 157.5, 202.5, 247.5, 292.5, 337.5])
+    labels = np.array(["N_S", "SW_NE", "E_W", "NW_SE", "N_S", "SW_NE", "E_W", "NW_SE", "N_S"])
 
-            cursor.updateRow(row)
+    directions = labels[np.digitize(arr["bearing"], edges)]
+
+    # Join the direction column back onto the shapefile in one write
+    bulk_update_field(line_shapefile, arr["OID@"], directions, "direction")
 
     print('Directions added')
 
@@ -92,132 +85,106 @@ def get_orientation(input_line_shapefile):
 # Function to create a generalized ecosite from S. Nielsen's work and save each ecosite polygon into a new shapefile.
 # Other users will need to rewrite this function for their own ecosite polygons
 def add_ecosite(input_ecosite_layer, output_folder):
-    # Create a field to hold the ecosite
-    arcpy.management.AddField(input_ecosite_layer, "ecosite", "TEXT", field_length=50)
-    fields = ['gridcode', 'ecosite']
-
-    with arcpy.da.UpdateCursor(input_ecosite_layer, fields) as cursor:
-        for row in cursor:
-            gridcode = row[0]
-
-            # Below are the gridcodes grouped for genearlized ecosites based on S. Nielsen's documentation
-            # Adjust these as necessary
-            gridcode_ecosite_mapping = {
-                (20, 21, 22): "UD",
-                (10, 11, 12): "UM",
-                (30, 31, 32): "T",
-                (40, 41, 42): "WT",
-                (50, 51, 52): "LDT"
-            }
-
-            # Find the ecosite corresponding to the gridcode
-            assigned_ecosite = "Unknown"
-            for gridcode_range, ecosite in gridcode_ecosite_mapping.items():
-                if isinstance(gridcode_range, int):
-                    if gridcode == gridcode_range:
-                        assigned_ecosite = ecosite
-                        break
-                else:
-                    if gridcode in gridcode_range:
-                        assigned_ecosite = ecosite
-                        break
-
-            #Update the ecosite data field
-            row[1] = assigned_ecosite
-            cursor.updateRow(row)
+
+    # Below are the gridcodes grouped for genearlized ecosites based on S. Nielsen's documentation
+    # Adjust these as necessary
+    # The lookup table is indexed directly by gridcode so the whole column can be
+    # mapped in one gather instead of scanning a dict for every row
+    lut = np.full(60, "Unknown", dtype="U7")
+    lut[[20, 21, 22]] = "UD"
+    lut[[10, 11, 12]] = "UM"
+    lut[[30, 31, 32]] = "T"
+    lut[[40, 41, 42]] = "WT"
+    lut[[50, 51, 52]] = "LDT"
+
+    # Read the gridcodes in bulk, map them through the lookup table and write the
+    # ecosite column back in a single join
+    arr = arcpy.da.FeatureClassToNumPyArray(input_ecosite_layer, ["OID@", "gridcode"])
+    ecosites = lut[np.clip(arr["gridcode"], 0, len(lut) - 1)]
+
+    bulk_update_field(input_ecosite_layer, arr["OID@"], ecosites, "ecosite")
 
     print('Generalized ecosites updated')
 
     # Create an output folder for the polygons if it doesn't already exist
     os.makedirs(output_folder, exist_ok=True)
 
-    # Create a feature layer for the input layer
-    input_layer_name = "input_layer"
-    arcpy.management.MakeFeatureLayer(input_ecosite_layer, input_layer_name)
-
-    # Create separate shapefiles for each ecosite
-    with arcpy.da.SearchCursor(input_ecosite_layer, 'ecosite') as search_cursor:
-        ecosite_values = set(row[0] for row in search_cursor if row[0] is not None)
+    # Split the layer into one shapefile per ecosite in a single pass rather than
+    # selecting and copying each ecosite value separately
+    arcpy.analysis.SplitByAttributes(input_ecosite_layer, output_folder, ["ecosite"])
 
-    for ecosite_value in ecosite_values:
-        output_shapefile = os.path.join(output_folder, f'{ecosite_value}_poly.shp')
-        sql_expression = f"ecosite = '{ecosite_value}'"
-        arcpy.management.MakeFeatureLayer(input_ecosite_layer, "temp_layer", where_clause=sql_expression)
-        arcpy.management.CopyFeatures("temp_layer", output_shapefile)
-        arcpy.management.Delete("temp_layer")
-        arcpy.management.ClearWorkspaceCache()
+    # SplitByAttributes names the outputs after the ecosite value, so add the
+    # _poly suffix that the downstream functions expect
+    for ecosite_value in np.unique(ecosites):
+        split_output = os.path.join(output_folder, f'{ecosite_value}.shp')
+        if arcpy.Exists(split_output):
+            arcpy.management.Rename(split_output, os.path.join(output_folder, f'{ecosite_value}_poly.shp'))
 
     print(f'Shapefiles created for each ecosite in {output_folder}')
 
 
 # This function clips the linear features by ecosite to make the data easier to manage
-def clip_lines_by_ecosite(ecosite_folder, input_line_shapefile, output_folder):
-    # Create the output folder if it doesn't exist
-    os.makedirs(output_folder, exist_ok=True)
+# The clipped lines are only consumed by create_strata, so they are kept in the
+# in_memory workspace instead of being serialized to a Working_Files folder
+def clip_lines_by_ecosite(ecosite_folder, input_line_shapefile, output_workspace="in_memory"):
 
     # Iterate over ecosite shapefiles
     for ecosite_file in os.listdir(ecosite_folder):
         if ecosite_file.endswith("_poly.shp") and "unknown_poly" not in ecosite_file.lower():
             ecosite_path = os.path.join(ecosite_folder, ecosite_file)
 
-            # Define the output shapefile path based on the ecosite name
+            # Define the output feature class based on the ecosite name
             ecosite_name = os.path.splitext(ecosite_file)[0].replace("_poly", "")
-            output_shapefile = os.path.join(output_folder, f'{ecosite_name}_lines.shp')
+            output_lines = f'{output_workspace}/{ecosite_name}_lines'
 
             # Clip the input line shapefile by the ecosite polygon
-            arcpy.analysis.Clip(input_line_shapefile, ecosite_path, output_shapefile)
+            arcpy.analysis.Clip(input_line_shapefile, ecosite_path, output_lines)
 
-            # Add a new field for ecosite in the clipped lines shapefile
-            arcpy.management.AddField(output_shapefile, "ecosite", "TEXT", field_length=50)
+            # Add a new field for ecosite in the clipped lines
+            arcpy.management.AddField(output_lines, "ecosite", "TEXT", field_length=50)
 
             # Calculate the ecosite field with the corresponding value
-            arcpy.management.CalculateField(output_shapefile, "ecosite", f"'{ecosite_name}'", "PYTHON3")
+            arcpy.management.CalculateField(output_lines, "ecosite", f"'{ecosite_name}'", "PYTHON3")
 
-            print(f'Lines clipped by {ecosite_name}. Output saved to {output_shapefile}')
+            print(f'Lines clipped by {ecosite_name}. Output saved to {output_lines}')
 
 
 # This code creates separate line shapefiles for each strata you are sampling over (ecosite + line width + direction)
-def create_strata(input_folder, output_folder):
-    arcpy.env.workspace = input_folder
+# The input is the in_memory workspace that clip_lines_by_ecosite filled;
+# the strata shapefiles themselves go to disk because the parallel clip
+# driver reads them from separate worker processes
+def create_strata(input_workspace, output_folder):
+    arcpy.env.workspace = input_workspace
     arcpy.env.overwriteOutput = True  # Allow overwriting of existing files
 
     # Create a common output folder so that subsequent functions can run over all files
     common_output_folder = output_folder
     os.makedirs(common_output_folder, exist_ok=True)
 
-    # Iterate over line shapefiles in the input folder
-    for line_shapefile in os.listdir(input_folder):
-        if line_shapefile.endswith(".shp"):
-            line_shapefile_path = os.path.join(input_folder, line_shapefile)
-
-            # Extract ecosite name from the file path or file name
-            ecosite_name = os.path.splitext(os.path.basename(line_shapefile))[0]
-
-            # Create a feature layer for the input line shapefile
-            input_layer_name = "input_layer"
-            arcpy.management.MakeFeatureLayer(line_shapefile_path, input_layer_name)
+    # Iterate over the clipped line feature classes in the workspace
+    for line_shapefile in arcpy.ListFeatureClasses():
+        line_shapefile_path = f'{input_workspace}/{line_shapefile}'
 
-            # Extract unique values from the 'line_type' and 'direction' fields
-            line_types = set(row[0] for row in arcpy.da.SearchCursor(line_shapefile_path, 'line_type') if row[0] is not None)
-            directions = set(row[0] for row in arcpy.da.SearchCursor(line_shapefile_path, 'direction') if row[0] is not None)
+        # Extract ecosite name from the file path or file name
+        ecosite_name = os.path.splitext(os.path.basename(line_shapefile))[0]
 
-            # Create shapefiles based on unique combinations of 'line_type' and 'direction'
-            for line_type in line_types:
-                for direction in directions:
-                    # Remove invalid characters from line_type and direction
-                    clean_line_type = arcpy.ValidateFieldName(line_type, common_output_folder)
-                    clean_direction = arcpy.ValidateFieldName(direction, common_output_folder)
+        # Split on every line_type/direction combination that actually occurs
+        # in one pass, instead of scanning for the unique values with two
+        # SearchCursors and selecting each combination separately.
+        # The split goes to a temporary folder because the output folder is
+        # shared between all of the ecosites.
+        split_folder = tempfile.mkdtemp()
+        arcpy.analysis.SplitByAttributes(line_shapefile_path, split_folder, ["line_type", "direction"])
 
-                    # Remove the first instance of "_lines_" from the output shapefile name
-                    output_shapefile = os.path.join(common_output_folder, f'{ecosite_name}_{clean_line_type}_{clean_direction}.shp')
-                    sql_expression = f"line_type = '{line_type}' AND direction = '{direction}'"
+        # SplitByAttributes names the outputs after the attribute values, so
+        # prefix them with the ecosite name
+        for strata_file in os.listdir(split_folder):
+            if strata_file.endswith('.shp'):
+                strata_name = os.path.splitext(strata_file)[0]
+                output_shapefile = os.path.join(common_output_folder, f'{ecosite_name}_{strata_name}.shp')
+                move_shapefile(os.path.join(split_folder, strata_file), output_shapefile)
 
-                    arcpy.management.MakeFeatureLayer(line_shapefile_path, "temp_layer", where_clause=sql_expression)
-                    arcpy.management.CopyFeatures("temp_layer", output_shapefile)
-                    arcpy.management.Delete("temp_layer")
-                    arcpy.management.ClearWorkspaceCache()
-
-                    print(f'Shapefile created for ecosite: {ecosite_name}, line_type: {clean_line_type}, direction: {clean_direction}. Output saved to {output_shapefile}')
+                print(f'Shapefile created for ecosite: {ecosite_name}, strata: {strata_name}. Output saved to {output_shapefile}')
 
 
 
@@ -228,60 +195,61 @@ def systematically_clip_lines(input_line_shapefile, systematic_grid_shapefile, o
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # In this case, we are only interested in N-S and E-W lines.
-    # Check if the input_line_shapefile contains "NW_SE" or "SW_NE" and skip if true
-    if "NW_SE" in input_line_shapefile or "SW_NE" in input_line_shapefile:
-        print(f"Skipping {input_line_shapefile}")
-        return
-
-    # Iterate over each grid cell
-    with arcpy.da.SearchCursor(systematic_grid_shapefile, ['SHAPE@', 'GRID_ID']) as cursor:
-        for row in cursor:
-            grid_cell_geometry = row[0]
-            grid_id = row[1]
-
-            # Create a layer to perform a spatial selection
-            if arcpy.Exists("temp_layer"):
-                arcpy.Delete_management("temp_layer")
+    # Get the base filename without the extension
+    base_filename = arcpy.Describe(input_line_shapefile).baseName
 
-            arcpy.management.MakeFeatureLayer(input_line_shapefile, "temp_layer")
-
-            # Select features that intersect with the current grid cell
-            arcpy.SelectLayerByLocation_management("temp_layer", "INTERSECT", grid_cell_geometry)
-
-            # Check if there are selected features
-            count = arcpy.management.GetCount("temp_layer")[0]
-
-            # Skip if the grid cell is empty.
-            # If this isn't done an empty shapefile will be created which upsets the random point generation script.
-            if int(count) == 0:
-                print(f"Skipping empty grid cell {grid_id}")
-                continue
-
-            # Get the base filename without the extension
-            base_filename = arcpy.Describe(input_line_shapefile).baseName
-
-            # Output path for the clipped shapefile
+    # In this case, we are only interested in N-S and E-W lines.
+    # Filter on the direction attribute rather than sniffing the filename;
+    # a file with no matching lines simply produces no outputs.
+    lines_layer = "lines_to_clip"
+    arcpy.management.MakeFeatureLayer(input_line_shapefile, lines_layer,
+                                      where_clause="direction IN ('N_S', 'E_W')")
+
+    # Intersect the lines with the whole grid in one indexed pass instead of
+    # selecting and clipping per grid cell, then split the result on GRID_ID.
+    # Empty grid cells naturally produce no output, so no empty shapefiles are
+    # created to upset the random point generation script.
+    # The spatial indexes are built once by clip_all_lines before the worker
+    # processes spawn - rebuilding the shared grid's index here would race
+    # between workers
+    intersect_output = "in_memory/cut"
+    arcpy.analysis.PairwiseIntersect([lines_layer, systematic_grid_shapefile], intersect_output)
+    arcpy.management.Delete(lines_layer)
+
+    # Split into a temporary folder first because the output folder is shared
+    # between all of the input line shapefiles
+    split_folder = tempfile.mkdtemp()
+    arcpy.analysis.SplitByAttributes(intersect_output, split_folder, ["GRID_ID"])
+    arcpy.management.Delete(intersect_output)
+
+    # SplitByAttributes names the outputs after the grid cell, so prefix them
+    # with the input filename the sampling functions expect
+    for filename in os.listdir(split_folder):
+        if filename.endswith('.shp'):
+            grid_id = os.path.splitext(filename)[0]
             output_path = os.path.join(output_folder, f'{base_filename}_{grid_id}.shp')
-
-            # Perform the clip operation
-            arcpy.analysis.Clip("temp_layer", grid_cell_geometry, output_path)
-
+            move_shapefile(os.path.join(split_folder, filename), output_path)
             print(f"Clipped shapefile saved to {output_path}")
 
-    # Clean up the temporary layer outside the loop
-    if arcpy.Exists("temp_layer"):
-        arcpy.Delete_management("temp_layer")
-
 
 # Run this with the previous function to clip all lines
+# The shapefiles are independent of each other, so they are clipped in parallel
+# subprocesses. Subprocesses also give each worker its own ArcPy session.
 def clip_all_lines(input_folder, systematic_grid_shapefile, output_folder):
-    for filename in os.listdir(input_folder):
-        if filename.endswith('.shp'):
-            input_line_shapefile = os.path.join(input_folder, filename)
+    shapefile_paths = [os.path.join(input_folder, filename) for filename in os.listdir(input_folder)
+                       if filename.endswith('.shp')]
+
+    # Build the spatial indexes once, before the workers spawn, so the
+    # intersects can use them without every worker rewriting the same
+    # index files concurrently
+    arcpy.management.AddSpatialIndex(systematic_grid_shapefile)
+    for shapefile_path in shapefile_paths:
+        arcpy.management.AddSpatialIndex(shapefile_path)
 
-            # Call the clip_lines function
-            systematically_clip_lines(input_line_shapefile, systematic_grid_shapefile, output_folder)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(systematically_clip_lines, shapefile_paths,
+                          [systematic_grid_shapefile] * len(shapefile_paths),
+                          [output_folder] * len(shapefile_paths)))
 
     print('All files lines clipped.')
 
@@ -315,6 +283,40 @@ def ran_sample_line(input_line_shapefile, output_folder):
     target_num_points = 30
     current_num_points = 0
 
+    # Read each line's segments once into NumPy arrays along with the cumulative
+    # segment lengths, so sample points can be interpolated with plain arithmetic
+    # instead of a positionAlongLine call per point.
+    # Only the shuffle needs to repeat when there are fewer lines than sample points.
+    spatial_reference = arcpy.Describe(line_shapefile).spatialReference
+    lines_order = []
+    for row in arcpy.da.SearchCursor(line_shapefile, 'SHAPE@'):
+        # Collect the segments of every part - the grid-intersect outputs are
+        # routinely multipart where a line crosses a cell more than once, so
+        # sampling only the first part would bias the points. Building the
+        # segments per part also avoids a phantom segment between part ends
+        seg_starts = []
+        seg_vecs = []
+        for part in row[0]:
+            part_xy = np.array([[pnt.X, pnt.Y] for pnt in part])
+            if len(part_xy) >= 2:
+                seg_starts.append(part_xy[:-1])
+                seg_vecs.append(np.diff(part_xy, axis=0))
+        if not seg_starts:
+            continue
+
+        starts = np.concatenate(seg_starts)
+        vecs = np.concatenate(seg_vecs)
+        lens = np.hypot(vecs[:, 0], vecs[:, 1])
+
+        # Drop zero-length segments so the interpolation never divides by zero
+        nonzero = lens > 0
+        starts, vecs, lens = starts[nonzero], vecs[nonzero], lens[nonzero]
+        if len(lens) == 0:
+            continue
+
+        cum = np.concatenate(([0], np.cumsum(lens)))
+        lines_order.append((starts, vecs, lens, cum))
+
     # Open an insert cursor for the new point feature class
     cursor = arcpy.da.InsertCursor(output_points_path, ['SHAPE@', 'LineID'])
     try:
@@ -322,16 +324,18 @@ def ran_sample_line(input_line_shapefile, output_folder):
         while current_num_points < target_num_points:
 
             # Randomly shuffle the lines
-            lines_order = [row[0] for row in arcpy.da.SearchCursor(line_shapefile, 'SHAPE@')]
             random.shuffle(lines_order)
 
             # Iterate through the shuffled lines
-            for line_id, line in enumerate(lines_order):
+            for line_id, (starts, vecs, lens, cum) in enumerate(lines_order):
                 # Generate a random distance along the line
                 distance = random.uniform(0, 1)
 
-                # Create a point at that location
-                point = line.positionAlongLine(distance, True)
+                # Interpolate the point at that location from the segment arrays
+                target = distance * cum[-1]
+                i = min(np.searchsorted(cum, target, side='right') - 1, len(lens) - 1)
+                px, py = starts[i] + (target - cum[i]) / lens[i] * vecs[i]
+                point = arcpy.PointGeometry(arcpy.Point(px, py), spatial_reference)
 
                 # Insert the point and line identifier number into the output feature class
                 cursor.insertRow([point, line_id])
@@ -351,6 +355,7 @@ def ran_sample_line(input_line_shapefile, output_folder):
 
 
 # Run this with the previous function to sample all lines.
+# Each shapefile is sampled in its own subprocess, same as clip_all_lines.
 def sample_all_lines(input_folder):
 
     # Specify the location for the output shapefiles
@@ -360,12 +365,14 @@ def sample_all_lines(input_folder):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # Iterate over each input_line_shapefile within a folder
+    # Sample each input_line_shapefile within the folder
     # input_folder = folder_loc + r'\Working_Files\Stratified_lines'
-    for filename in os.listdir(input_folder):
-        if filename.endswith('.shp'):
-            input_line_shapefile = os.path.join(input_folder, filename)
-            ran_sample_line(input_line_shapefile, output_folder)
+    shapefile_paths = [os.path.join(input_folder, filename) for filename in os.listdir(input_folder)
+                       if filename.endswith('.shp')]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(ran_sample_line, shapefile_paths,
+                          [output_folder] * len(shapefile_paths)))
 
 
 
@@ -376,57 +383,39 @@ def sample_all_lines(input_folder):
 # The input wellpad shapefile has been manually edited to remove pads that intersected facilities and infrastructure
 # Irregular pads with multi wells were also removed.
 def assign_ecosite_to_shl(shl_shapefile):
-    # Specify the output coordinate system WKID
-    target_coordinate_system_wkid = 26912
-
     # Create the output folder if it doesn't exist
     output_folder = os.path.join(folder_loc, 'Working_Files', 'SHL_Ecosite')
     os.makedirs(output_folder, exist_ok=True)
 
     ecosite_folder = os.path.join(folder_loc, 'Working_Files', 'Ecosite_polys')
 
-    # Add the ecosite field to the SHL shapefile
-    field_names = [field.name for field in arcpy.ListFields(shl_shapefile)]
-    if "ecosite" not in field_names:
-        arcpy.management.AddField(shl_shapefile, "ecosite", "TEXT", field_length=50)
-
-    # Iterate over each ecosite shapefile in the folder
-    for ecosite_file in os.listdir(ecosite_folder):
-        if ecosite_file.endswith("_poly.shp") and "unknown_poly" not in ecosite_file.lower():
-            ecosite_path = os.path.join(ecosite_folder, ecosite_file)
-
-            # Define the output shapefile path based on the ecosite name
-            ecosite_name = os.path.splitext(ecosite_file)[0].replace("_poly", "")
-            output_shl_with_ecosite = os.path.join(output_folder, f'SHL_{ecosite_name}.shp')
-
-            print(f"Processing ecosite: {ecosite_name}")
-
-            # Make sure the existing layer is deleted before creating it again
-            shl_layer_name = "shl_layer"
-            if arcpy.Exists(shl_layer_name):
-                arcpy.Delete_management(shl_layer_name)
+    # Merge the per-ecosite polygons back together so a single spatial join can
+    # resolve every SHL's ecosite in one indexed pass, instead of a spatial
+    # selection and a full UpdateCursor write per ecosite shapefile
+    ecosite_paths = [os.path.join(ecosite_folder, ecosite_file) for ecosite_file in os.listdir(ecosite_folder)
+                     if ecosite_file.endswith("_poly.shp") and "unknown_poly" not in ecosite_file.lower()]
 
-            # Make a feature layer for the SHL shapefile
-            arcpy.MakeFeatureLayer_management(shl_shapefile, shl_layer_name)
+    merged_ecosites = "in_memory/all_eco"
+    arcpy.management.Merge(ecosite_paths, merged_ecosites)
 
-            # Make a feature layer for the ecosite shapefile
-            ecosite_layer_name = f"ecosite_layer_{ecosite_name}"
-            arcpy.MakeFeatureLayer_management(ecosite_path, ecosite_layer_name)
+    joined_shl = "in_memory/shl_eco"
+    arcpy.analysis.SpatialJoin(shl_shapefile, merged_ecosites, joined_shl, "JOIN_ONE_TO_ONE", "KEEP_COMMON")
 
-            # Select SHL features that intersect with the ecosite polygon
-            arcpy.SelectLayerByLocation_management(shl_layer_name, "INTERSECT", ecosite_layer_name)
+    # Split the joined result into the per-ecosite shapefiles that the grid
+    # stratification step expects
+    split_folder = tempfile.mkdtemp()
+    arcpy.analysis.SplitByAttributes(joined_shl, split_folder, ["ecosite"])
+    arcpy.management.Delete(merged_ecosites)
+    arcpy.management.Delete(joined_shl)
 
-            # Update ecosite field for selected features
-            with arcpy.da.UpdateCursor(shl_layer_name, ["ecosite"]) as cursor:
-                for row in cursor:
-                    row[0] = ecosite_name
-                    cursor.updateRow(row)
+    for ecosite_file in os.listdir(split_folder):
+        if ecosite_file.endswith(".shp"):
+            ecosite_name = os.path.splitext(ecosite_file)[0]
 
-            # Save the updated SHL shapefile
-            arcpy.CopyFeatures_management(shl_layer_name, output_shl_with_ecosite)
+            print(f"Processing ecosite: {ecosite_name}")
 
-            # Clear the selection on SHL shapefile
-            arcpy.SelectLayerByAttribute_management(shl_layer_name, "CLEAR_SELECTION")
+            move_shapefile(os.path.join(split_folder, ecosite_file),
+                           os.path.join(output_folder, f'SHL_{ecosite_name}.shp'))
 
     print("Surface hole locations with ecosites complete.")
 
@@ -449,62 +438,98 @@ def grid_shl_ecosites():
             # Get the ecosite name from the file name
             ecosite_name = os.path.splitext(shl_ecosite_file)[0].replace("SHL_", "")
 
-            # Create a feature layer for the SHL_ecosite shapefile
-            shl_ecosite_layer_name = f"shl_ecosite_layer_{ecosite_name}"  # Use a unique name
-            arcpy.MakeFeatureLayer_management(shl_ecosite_path, shl_ecosite_layer_name)
+            # Intersect the SHL points with the whole grid in one pass instead of
+            # selecting and clipping per grid cell. The grid's GRID_ID attribute
+            # is carried onto the output, so the separate Grid_ID field and the
+            # per-cell UpdateCursor are no longer needed.
+            # Build the spatial index up front so the intersect can reuse it
+            arcpy.management.AddSpatialIndex(shl_ecosite_path)
+
+            intersect_output = f"in_memory/grid_{ecosite_name}"
+            arcpy.analysis.PairwiseIntersect([shl_ecosite_path, systematic_grid_shapefile], intersect_output)
+
+            # Split into a temporary folder, then rename with the ecosite prefix.
+            # Empty grid cells naturally produce no output.
+            split_folder = tempfile.mkdtemp()
+            arcpy.analysis.SplitByAttributes(intersect_output, split_folder, ["GRID_ID"])
+            arcpy.management.Delete(intersect_output)
+
+            for grid_file in os.listdir(split_folder):
+                if grid_file.endswith('.shp'):
+                    grid_id = os.path.splitext(grid_file)[0]
+                    output_path = os.path.join(output_folder, f'SHL_{ecosite_name}_{grid_id}.shp')
+                    move_shapefile(os.path.join(split_folder, grid_file), output_path)
 
-            # Add a field to store the grid cell name
-            arcpy.AddField_management(shl_ecosite_layer_name, "Grid_ID", "TEXT", field_length=50)
+                    print(f"Clipped SHL_ecosite shapefile for ecosite {ecosite_name} in grid cell {grid_id}. Output saved to {output_path}")
 
-            # Iterate over each grid cell
-            with arcpy.da.SearchCursor(systematic_grid_shapefile, ['SHAPE@', 'GRID_ID']) as cursor:
-                for row in cursor:
-                    grid_cell_geometry = row[0]
-                    grid_id = row[1]
 
-                    # Create a layer to perform a spatial selection
-                    if arcpy.Exists("temp_layer"):
-                        arcpy.Delete_management("temp_layer")
 
-                    arcpy.management.MakeFeatureLayer(shl_ecosite_path, "temp_layer")
+# Randomly sample one grid-stratified SHL shapefile
+def sample_shl_file(input_grid_strat_SHL, output_folder):
 
-                    # Select features that intersect with the current grid cell
-                    arcpy.SelectLayerByLocation_management("temp_layer", "INTERSECT", grid_cell_geometry)
+    # Number of features to sample
+    num_features_to_sample = 5
 
-                    # Check if there are selected features
-                    count = arcpy.management.GetCount("temp_layer")[0]
+    # Check if the input shapefile exists
+    if not arcpy.Exists(input_grid_strat_SHL):
+        print(f"Skipping non-existent input shapefile: {input_grid_strat_SHL}")
+        return
 
-                    # Skip if the grid cell is empty.
-                    if int(count) == 0:
-                        print(f"Skipping empty grid cell {grid_id} for ecosite {ecosite_name}")
-                        continue
+    # Check if the feature class is a multipoint feature class
+    desc = arcpy.Describe(input_grid_strat_SHL)
+    if desc.shapeType != 'Multipoint':
+        print(f"Skipping non-multipoint feature class: {input_grid_strat_SHL}")
+        return
 
-                    # Output path for the clipped shapefile
-                    output_path = os.path.join(output_folder, f'SHL_{ecosite_name}_{grid_id}.shp')
+    # Get the total number of features in the input shapefile
+    total_features = int(arcpy.management.GetCount(input_grid_strat_SHL).getOutput(0))
 
-                    # Perform the clip operation
-                    arcpy.analysis.Clip("temp_layer", grid_cell_geometry, output_path)
+    # Check if there are features to sample
+    if total_features == 0:
+        print(f"Skipping empty shapefile: {input_grid_strat_SHL}")
+        return
 
-                    # Update the Grid_Cell_Name field in the output shapefile
-                    with arcpy.da.UpdateCursor(output_path, "Grid_ID") as update_cursor:
-                        for update_row in update_cursor:
-                            update_row[0] = f"{grid_id}"
-                            update_cursor.updateRow(update_row)
+    # Generate a random list of the FIDs to sample
+    sampled_fids = random.sample(range(total_features), min(num_features_to_sample, total_features))
 
-                    print(f"Clipped SHL_ecosite shapefile for ecosite {ecosite_name} in grid cell {grid_id}. Output saved to {output_path}")
+    # Check if there are features to sample
+    if not sampled_fids:
+        print(f"No features selected for random sampling in {input_grid_strat_SHL}")
+        return
+
+    # Create an output shapefile for the random samples using the name of the input shapefile
+    base_filename = os.path.splitext(os.path.basename(input_grid_strat_SHL))[0]
+    output_path = os.path.join(output_folder, f'{base_filename}_rndsample.shp')
+
+    # Create a new feature class for the randomly sampled features
+    arcpy.CreateFeatureclass_management(output_folder, os.path.basename(output_path), 'MULTIPOINT', input_grid_strat_SHL)
+
+    # Define the projection for the output feature class
+    arcpy.management.DefineProjection(output_path, SR_26912)
+
+    # Fetch only the sampled rows with a where clause on the FID, rather than
+    # scanning every feature and testing its position against the sampled list
+    where_clause = f'"FID" IN ({",".join(map(str, sampled_fids))})'
+
+    # List the fields once and share the list between both cursors
+    cursor_fields = ['SHAPE@'] + [field.name for field in arcpy.ListFields(input_grid_strat_SHL) if field.type != 'OID' and field.name != 'Licence']
 
-            # Clean up the temporary layer outside the loop
-            if arcpy.Exists("temp_layer"):
-                arcpy.Delete_management("temp_layer")
+    # Open an insert cursor for the new feature class
+    with arcpy.da.InsertCursor(output_path, cursor_fields) as cursor:
 
+        # Open a search cursor for the sampled features only
+        with arcpy.da.SearchCursor(input_grid_strat_SHL, cursor_fields, where_clause=where_clause) as search_cursor:
+            for row in search_cursor:
+                cursor.insertRow(row)
+
+    print(f"Features randomly sampled and saved to {output_path}")
 
 
 # A funtion to randomly sample the SHL
+# The grid-stratified shapefiles are independent, so they are sampled in
+# parallel subprocesses like the line drivers above.
 def random_sample_shl():
 
-    # Specify the WKID for the target coordinate system
-    target_coordinate_system_wkid = 26912
-
     input_grid_strat_SHL_folder = os.path.join(folder_loc, 'Working_Files', 'Grid_stratified_SHL')
     output_folder = os.path.join(folder_loc, 'Working_Files', 'Syst_rand_SHL')
 
@@ -512,63 +537,14 @@ def random_sample_shl():
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # Number of features to sample
-    num_features_to_sample = 5
-
-    # Iterate over each shapefile in the input folder
+    # Collect each shapefile in the input folder
+    shl_paths = []
     for root, dirs, files in arcpy.da.Walk(input_grid_strat_SHL_folder, datatype="FeatureClass"):
         for file in files:
-            input_grid_strat_SHL = os.path.join(root, file)
+            shl_paths.append(os.path.join(root, file))
 
-            # Check if the input shapefile exists
-            if not arcpy.Exists(input_grid_strat_SHL):
-                print(f"Skipping non-existent input shapefile: {input_grid_strat_SHL}")
-                continue
-
-            # Check if the feature class is a multipoint feature class
-            desc = arcpy.Describe(input_grid_strat_SHL)
-            if desc.shapeType != 'Multipoint':
-                print(f"Skipping non-multipoint feature class: {input_grid_strat_SHL}")
-                continue
-
-            # Get the total number of features in the input shapefile
-            total_features = int(arcpy.management.GetCount(input_grid_strat_SHL).getOutput(0))
-
-            # Check if there are features to sample
-            if total_features == 0:
-                print(f"Skipping empty shapefile: {input_grid_strat_SHL}")
-                continue
-
-            # Generate a random list of the features to sample
-            sampled_list = random.sample(range(total_features), min(num_features_to_sample, total_features))
-
-            # Check if there are features to sample
-            if not sampled_list:
-                print(f"No features selected for random sampling in {input_grid_strat_SHL}")
-                continue
-
-            # Create an output shapefile for the random samples using the name of the input shapefile
-            base_filename = os.path.splitext(os.path.basename(input_grid_strat_SHL))[0]
-            output_path = os.path.join(output_folder, f'{base_filename}_rndsample.shp')
-
-            # Create a new feature class for the randomly sampled features
-            arcpy.CreateFeatureclass_management(output_folder, os.path.basename(output_path), 'MULTIPOINT', input_grid_strat_SHL)
-
-            # Define the projection for the output feature class
-            arcpy.management.DefineProjection(output_path, arcpy.SpatialReference(target_coordinate_system_wkid))
-
-            # Open an insert cursor for the new feature class
-            with arcpy.da.InsertCursor(output_path, ['SHAPE@'] + [field.name for field in arcpy.ListFields(input_grid_strat_SHL) if field.type != 'OID' and field.name != 'Licence']) as cursor:
-
-                # Open a search cursor for the input shapefile
-                with arcpy.da.SearchCursor(input_grid_strat_SHL, ['SHAPE@'] + [field.name for field in arcpy.ListFields(input_grid_strat_SHL) if field.type != 'OID' and field.name != 'Licence']) as search_cursor:
-                    for index, row in enumerate(search_cursor):
-
-                        # If the current feature number is in the randomly sampled list, insert it into the output shapefile
-                        if index in sampled_list:
-                            cursor.insertRow(row)
-
-            print(f"Features randomly sampled and saved to {output_path}")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(sample_shl_file, shl_paths, [output_folder] * len(shl_paths)))
 
 
 
@@ -597,39 +573,26 @@ def combine_shapefiles():
     # Check if there are any shapefiles found
     if not input_shapefiles:
         print("No input shapefiles found.")
-        return
-
-    # Create the output folder if it doesn't exist
-    output_folder = os.path.dirname(output_shapefile)
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    # Get the fields of the first input shapefile
-    fields = [field.name for field in arcpy.ListFields(input_shapefiles[0]) if field.type not in ['Geometry', 'OID']]
+        return None
 
-    # Create a new feature class to hold the combined features
-    arcpy.management.CreateFeatureclass(os.path.dirname(output_shapefile), os.path.basename(output_shapefile),
-                                        "MULTIPOINT", spatial_reference=input_shapefiles[0])
+    # Merge everything in one native call rather than copying row by row
+    # between cursors. Merge reconciles the schemas itself, so the fields no
+    # longer get coerced to TEXT on the way through.
+    # The combined points go to memory first so build_area_plot can buffer
+    # them without reading the shapefile back off disk.
+    combined_points = "in_memory/rand_shl_comb"
+    arcpy.management.Merge(input_shapefiles, combined_points)
 
-    # Add the attribute fields to the output shapefile
-    for field in fields:
-        arcpy.management.AddField(output_shapefile, field, "TEXT")
-
-    # Open an insert cursor for the output shapefile
-    with arcpy.da.InsertCursor(output_shapefile, ['SHAPE@'] + fields) as cursor:
-        # Iterate over each input shapefile
-        for input_shapefile in input_shapefiles:
-            # Open a search cursor for the current input shapefile
-            with arcpy.da.SearchCursor(input_shapefile, ['SHAPE@'] + fields) as search_cursor:
-                # Iterate over each feature in the current input shapefile and insert it into the output shapefile
-                for row in search_cursor:
-                    cursor.insertRow(row)
+    # Persist one copy to disk since the matrix plot script reads it later
+    arcpy.management.CopyFeatures(combined_points, output_shapefile)
 
     print(f"Combined shapefiles saved to {output_shapefile}")
 
+    return combined_points
+
 
 # A function to build the wellpad plots
-def build_area_plot():
+def build_area_plot(input_points=None):
 
     # Create an output folder for the files
     output_folder = os.path.join(folder_loc, 'Working_Files', 'SHL_plots')
@@ -638,8 +601,11 @@ def build_area_plot():
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # Add the combined sampled file in as the input file
-    input_shapefile = folder_loc + r'\Working_Files\SHL_RanSamp_comb\Rand_SHL_comb.shp'
+    # Buffer the in-memory combined points from combine_shapefiles when they
+    # are available, falling back to the combined shapefile on disk
+    if input_points is None:
+        input_points = folder_loc + r'\Working_Files\SHL_RanSamp_comb\Rand_SHL_comb.shp'
+
     output_shapefile = output_folder + r'\Sur_ranpad_100m.shp'
 
 
@@ -647,7 +613,7 @@ def build_area_plot():
     buffer_distance = 5.6419
     # Perform buffer analysis
     arcpy.analysis.Buffer(
-        in_features=input_shapefile,
+        in_features=input_points,
         out_feature_class=output_shapefile,
         buffer_distance_or_field=buffer_distance,
         line_side="FULL",
@@ -661,25 +627,32 @@ def build_area_plot():
 
 # Folder locations and files that you need to point to
 folder_loc = (r'C:\BERA\00_Footprints_creation\Samples')
+
+# Target coordinate system, built once rather than per output file
+SR_26912 = arcpy.SpatialReference(26912)
 systematic_grid_shapefile = (folder_loc + r'\Source_files\Grid_15k_prj.shp')
 ecosite_shapefile = (folder_loc + r'\Source_files\veg4_sur.shp')
 original_lines = (folder_loc + r'\Source_files\Sur_2023_CL_ed.shp')
 shl_shapefile = (folder_loc + r'\Source_files\Surmont_shl_2023_11_prj.shp')
 
 
-setup_folders(folder_loc)
+# The guard is needed so that the parallel drivers can re-import this module
+# in their worker processes without re-running the whole pipeline
+if __name__ == '__main__':
+
+    setup_folders(folder_loc)
 
-###Line sampling
-get_orientation(original_lines)
-add_ecosite(ecosite_shapefile, folder_loc + r'\Working_Files\Ecosite_polys')
-clip_lines_by_ecosite(folder_loc + r'\Working_Files\Ecosite_polys', folder_loc + r'\Source_files\Sur_2023_CL_ed.shp', folder_loc + r'\Working_Files\Lines_ecosite')
-create_strata(folder_loc + r'\Working_Files\Lines_ecosite', folder_loc + r'\Working_Files\Stratified_lines')
-clip_all_lines(folder_loc + r'\Working_Files\Stratified_lines', systematic_grid_shapefile, folder_loc + r'\Working_Files\Grid_stratified_lines')
-sample_all_lines(folder_loc + r'\Working_Files\Grid_stratified_lines')
+    ###Line sampling
+    get_orientation(original_lines)
+    add_ecosite(ecosite_shapefile, folder_loc + r'\Working_Files\Ecosite_polys')
+    clip_lines_by_ecosite(folder_loc + r'\Working_Files\Ecosite_polys', folder_loc + r'\Source_files\Sur_2023_CL_ed.shp', 'in_memory')
+    create_strata('in_memory', folder_loc + r'\Working_Files\Stratified_lines')
+    clip_all_lines(folder_loc + r'\Working_Files\Stratified_lines', systematic_grid_shapefile, folder_loc + r'\Working_Files\Grid_stratified_lines')
+    sample_all_lines(folder_loc + r'\Working_Files\Grid_stratified_lines')
 
-#####Wellpad sampling
-assign_ecosite_to_shl(shl_shapefile)
-grid_shl_ecosites()
-random_sample_shl()
-combine_shapefiles()
-build_area_plot()
\ No newline at end of file
+    #####Wellpad sampling
+    assign_ecosite_to_shl(shl_shapefile)
+    grid_shl_ecosites()
+    random_sample_shl()
+    combined_points = combine_shapefiles()
+    build_area_plot(combined_points)
\ No newline at end of file
@@ -14,10 +14,31 @@
 #-------------------------------------------------------------------------------
 
 import arcpy
+import numpy as np
 import os
 import csv
-import math
+import struct
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import Process
+
+
+# Describe does a fresh metadata fetch on every call, so cache the result per
+# path. Call _describe.cache_clear() if a described dataset gets rewritten.
+@lru_cache(maxsize=None)
+def _describe(path):
+    return arcpy.Describe(path)
+
+
+# Build little-endian WKB for a LineString from (x, y) pairs. Feeding the
+# insert cursors SHAPE@WKB bytes skips the arcpy.Point/Array/Polyline object
+# allocations per feature and lets arcpy parse the geometry in C.
+def _wkb_line(*points):
+    wkb = struct.pack("<BII", 1, 2, len(points))
+    for x, y in points:
+        wkb += struct.pack("<dd", x, y)
+    return wkb
 
 
 #################### Matrix plots for lines
@@ -25,91 +46,108 @@ import tempfile
 # Set up folders for the files
 def setup_folders(root_folder):
 
-    try:
-        os.makedirs(root_folder)
-        print("Folder %s created" % root_folder)
-
-    except FileExistsError:
-        print("Folder %s already exists" % root_folder)
-
-    try:
-        folder_list = ['Line_midpoint', 'Matrix_loc', 'Matrix_plots', 'Wellpad_matrix_loc', 'Wellpad_plots']
-        for folder in folder_list:
-            path = os.path.join(root_folder, folder)
-            os.mkdir(path)
+    # exist_ok means a folder that is already there never aborts the loop,
+    # so every subfolder gets created even when some exist from a prior run
+    folder_list = ['Line_midpoint', 'Matrix_loc', 'Matrix_plots', 'Wellpad_plots']
+    for folder in folder_list:
+        os.makedirs(os.path.join(root_folder, folder), exist_ok=True)
 
-    except FileExistsError:
-        print("Folders already exist")
+    # Wellpad pipeline intermediates go in a file geodatabase instead of
+    # shapefiles - much faster I/O and spatial indexes come for free
+    if not arcpy.Exists(work_gdb):
+        arcpy.management.CreateFileGDB(root_folder, 'work.gdb')
 
     print ('Folders done.')
 
 
 # A function to append the existing coordinates onto the existing digitized footprint shapefile
-def calculate_polygon_center():
-
-    # Set the workspace environment
-    arcpy.env.workspace = arcpy.Describe(input_foot_shp).path
+def calculate_polygon_center(foot_shp=None):
 
-    # Add fields to store X and Y coordinates in the polygon attribute table
-    arcpy.AddField_management(input_foot_shp, "Centroid_X", "DOUBLE")
-    arcpy.AddField_management(input_foot_shp, "Centroid_Y", "DOUBLE")
+    if foot_shp is None:
+        foot_shp = input_foot_shp
 
-    # Calculate the centroid coordinates and update the attribute table
-    with arcpy.da.UpdateCursor(input_foot_shp, ["SHAPE@", "Centroid_X", "Centroid_Y"]) as cursor:
-        for row in cursor:
-            try:
-                # Get the centroid coordinates directly from SHAPE@XY
-                centroid_x, centroid_y = row[0].centroid.X, row[0].centroid.Y
+    # Set the workspace environment
+    arcpy.env.workspace = _describe(foot_shp).path
 
-                # Update the attribute table with centroid coordinates
-                row[1] = centroid_x
-                row[2] = centroid_y
+    # Read every centroid in one pass and join the coordinate columns back onto
+    # the attribute table in a single write, instead of updating row by row
+    arr = arcpy.da.FeatureClassToNumPyArray(foot_shp, ["OID@", "SHAPE@XY"])
+    centroid_x = arr["SHAPE@XY"][:, 0]
+    centroid_y = arr["SHAPE@XY"][:, 1]
 
-                cursor.updateRow(row)
-            except Exception as e:
-                print(f"Error processing row {row[0]}: {e}")
+    centroid_arr = np.rec.fromarrays([arr["OID@"], centroid_x, centroid_y],
+                                     names=["OID_", "Centroid_X", "Centroid_Y"])
+    arcpy.da.ExtendTable(foot_shp, "OID@", centroid_arr, "OID_")
 
     print("Centroid coordinates calculated and stored in the attribute table.")
 
 
 # A function to create footprint centroid shapefiles
-def create_point_shapefile():
+def create_point_shapefile(foot_shp=None, output_point_shp=None):
+
+    if foot_shp is None:
+        foot_shp = input_foot_shp
+    if output_point_shp is None:
+        output_point_shp = folder_loc + r'\Line_midpoint\Centroid_Points.shp'
 
     # Set the workspace environment
-    arcpy.env.workspace = arcpy.Describe(input_foot_shp).path
+    arcpy.env.workspace = _describe(foot_shp).path
 
-    output_point_shp = folder_loc + r'\Line_midpoint\Centroid_Points.shp'
+    # Build the centroid points straight from the Centroid_X/Y columns that
+    # calculate_polygon_center added. XYTableToPoint carries all of the
+    # original attributes across in one tool call, with their field types
+    # intact, so the feature class creation and cursor copy are not needed.
+    arcpy.management.XYTableToPoint(foot_shp, output_point_shp,
+                                    "Centroid_X", "Centroid_Y",
+                                    coordinate_system=_describe(foot_shp).spatialReference)
 
-    # Create a point feature class with the same spatial reference as the input polygon shapefile
-    spatial_reference = arcpy.Describe(input_foot_shp).spatialReference
-    arcpy.management.CreateFeatureclass(os.path.dirname(output_point_shp), os.path.basename(output_point_shp), "POINT", spatial_reference=spatial_reference)
+    print(f"Point shapefile created at: {output_point_shp}")
 
-    # Get the field names from the input polygon shapefile
-    field_names = [field.name for field in arcpy.ListFields(input_foot_shp)]
 
-    # Add fields to the output point shapefile if they do not already exist
-    for field_name in field_names:
-        # Skip shape-related fields
-        if field_name.lower() not in ["shape", "shape_length", "shape_area"]:
-            if not arcpy.ListFields(output_point_shp, field_name):
-                arcpy.AddField_management(output_point_shp, field_name, "TEXT")  # You can modify the field type as needed
+# Process one FID range of the footprints in its own shapefile so that the
+# centroid stages can run in a worker subprocess
+def _process_tile(fid_range, tile_folder):
+    fid_lo, fid_hi = fid_range
 
-    # Apply field mappings and calculate the centroid coordinates
-    with arcpy.da.InsertCursor(output_point_shp, ["SHAPE@", "Centroid_X", "Centroid_Y"] + field_names) as cursor:
-        with arcpy.da.SearchCursor(input_foot_shp, ["SHAPE@", "Centroid_X", "Centroid_Y"] + field_names) as search_cursor:
-            for row in search_cursor:
-                try:
-                    # Create a point feature at the centroid coordinates
-                    point = arcpy.Point(row[1], row[2])
-                    point_geometry = arcpy.PointGeometry(point, spatial_reference)
+    tile_foot = os.path.join(tile_folder, f'foot_{fid_lo}_{fid_hi}.shp')
+    arcpy.management.MakeFeatureLayer(input_foot_shp, 'foot_tile', f'"FID" >= {fid_lo} AND "FID" < {fid_hi}')
+    arcpy.management.CopyFeatures('foot_tile', tile_foot)
+    arcpy.management.Delete('foot_tile')
 
-                    # Insert the point feature into the output shapefile
-                    cursor.insertRow([point_geometry, row[1], row[2]] + list(row[3:]))
-                except Exception as e:
-                    print(f"Error inserting row. Fields: {field_names}")
-                    raise e
+    calculate_polygon_center(tile_foot)
 
-    print(f"Point shapefile created at: {output_point_shp}")
+    tile_points = tile_foot.replace('.shp', '_pts.shp')
+    create_point_shapefile(tile_foot, tile_points)
+
+    return tile_points
+
+
+# Run the centroid stages over FID-range tiles in parallel subprocesses and
+# merge the per-tile points back into the single centroid shapefile the
+# bearing-line stage reads. The footprints are independent of each other, so
+# the tiles can be processed concurrently; note this must only be called from
+# under the __main__ guard so the workers can re-import this module safely.
+def run_tiled_centroids(num_tiles=None):
+
+    if num_tiles is None:
+        num_tiles = os.cpu_count()
+
+    total_features = int(arcpy.management.GetCount(input_foot_shp).getOutput(0))
+    tile_size = max(1, -(-total_features // num_tiles))
+    fid_ranges = [(fid_lo, fid_lo + tile_size) for fid_lo in range(0, total_features, tile_size)]
+
+    tile_folder = tempfile.mkdtemp()
+    with ProcessPoolExecutor(max_workers=num_tiles) as executor:
+        tile_points = list(executor.map(_process_tile, fid_ranges, [tile_folder] * len(fid_ranges)))
+
+    arcpy.management.Merge(tile_points, folder_loc + r'\Line_midpoint\Centroid_Points.shp')
+
+    # The tiles only carried the centroid columns on throwaway copies, so
+    # also write Centroid_X/Y onto the source footprints - other steps read
+    # those fields off the original shapefile
+    calculate_polygon_center()
+
+    print('Tiled centroid stages complete.')
 
 
 # A function to create bearing lines originating from the centerpoint and going orthogonal to the NS or EW direction specified in the attribute table
@@ -117,7 +155,7 @@ def create_bearing_lines():
 
     input_point_shp = folder_loc + r'\Line_midpoint\Centroid_Points.shp'
 
-    bearing_line = folder_loc + r'\Matrix_loc\matrix_bearing.shp'
+    bearing_line = matrix_bearing_fc
 
     #Set a line length that will extend beyond the edges of your digitzed sample, but not too long that it intersects with another
     length = 100
@@ -131,35 +169,31 @@ def create_bearing_lines():
     # Add fields to the output line shapefile
     arcpy.AddField_management(bearing_line, "Direction", "TEXT")
 
-    # Insert line features for each point in the input shapefile
-    with arcpy.da.SearchCursor(input_point_shp, ["SHAPE@", "Direction"]) as search_cursor:
-        with arcpy.da.InsertCursor(bearing_line, ["SHAPE@", "Direction"]) as insert_cursor:
-            for row in search_cursor:
-                try:
-                    # Extract the point geometry and direction from the input point
-                    point_geometry, direction = row[0], row[1]
-
-                    # Create the line features.
-                    # If the seismic line is oriented NS, the bearing line should be EW
-                    # If the seismic line is oriented EW, the bearing line should be NS
-                    if direction in ["E_W", "N_S"]:
-                        if direction == "E_W":
-                            start_point = arcpy.Point(point_geometry.centroid.X, point_geometry.centroid.Y - length/2)
-                            end_point = arcpy.Point(point_geometry.centroid.X, point_geometry.centroid.Y + length/2)
-                        else:
-                            start_point = arcpy.Point(point_geometry.centroid.X - length/2, point_geometry.centroid.Y)
-                            end_point = arcpy.Point(point_geometry.centroid.X + length/2, point_geometry.centroid.Y)
-
-                        array = arcpy.Array([start_point, end_point])
-                        line_geometry = arcpy.Polyline(array, spatial_reference)
-
-                        # Insert the line feature into the output shapefile
-                        insert_cursor.insertRow([line_geometry, direction])
-                    else:
-                        print(f"Ignoring point with unknown direction: {direction}")
-
-                except Exception as e:
-                    print(f"Error processing point: {e}")
+    # Load every centroid and direction at once and compute all of the start and
+    # end coordinates with NumPy masks, so the insert loop only has to build the
+    # final line geometries
+    arr = arcpy.da.FeatureClassToNumPyArray(input_point_shp, ["SHAPE@XY", "Direction"])
+
+    known = np.isin(arr["Direction"], ["E_W", "N_S"])
+    for direction in arr["Direction"][~known]:
+        print(f"Ignoring point with unknown direction: {direction}")
+    arr = arr[known]
+
+    xs = arr["SHAPE@XY"][:, 0]
+    ys = arr["SHAPE@XY"][:, 1]
+
+    # If the seismic line is oriented NS, the bearing line should be EW
+    # If the seismic line is oriented EW, the bearing line should be NS
+    is_ew = arr["Direction"] == "E_W"
+    sx = np.where(is_ew, xs, xs - length/2)
+    ex = np.where(is_ew, xs, xs + length/2)
+    sy = np.where(is_ew, ys - length/2, ys)
+    ey = np.where(is_ew, ys + length/2, ys)
+
+    # Insert the precomputed line features into the output shapefile
+    with arcpy.da.InsertCursor(bearing_line, ["SHAPE@WKB", "Direction"]) as insert_cursor:
+        for i in range(len(arr)):
+            insert_cursor.insertRow([_wkb_line((sx[i], sy[i]), (ex[i], ey[i])), arr["Direction"][i]])
 
     print(f"Bearing shapefile created at: {bearing_line}")
 
@@ -167,14 +201,17 @@ def create_bearing_lines():
 # A function to cut the bearing line where it intersects the edge of the digitized footprint
 def bearing_clip_footprint():
 
-    bearing_line = folder_loc + r'\\Matrix_loc\matrix_bearing.shp'
-    bearing_line_clip = folder_loc + r'\Matrix_loc\bearing_clip.shp'
+    bearing_line = matrix_bearing_fc
+    bearing_line_clip = bearing_clip_fc
 
     try:
+        # Only carry the FIDs through the intersect - the downstream
+        # SpatialJoin in intersect_and_transfer_attributes re-attaches the
+        # footprint attributes, so copying every field here is wasted I/O
         arcpy.analysis.PairwiseIntersect(
             in_features=f"{bearing_line};{input_foot_shp}",
             out_feature_class=bearing_line_clip,
-            join_attributes="ALL",
+            join_attributes="ONLY_FID",
             cluster_tolerance=None,
             output_type="INPUT"
         )
@@ -187,55 +224,64 @@ def bearing_clip_footprint():
 # A function to extend lines to a specified distance in the matrix to locate the centerpoint of the matrix plot
 def extend_lines(extension_length):
 
-    bearing_lines_clip = folder_loc + r'\Matrix_loc\bearing_clip.shp'
-    matrix_extended_line = folder_loc + r'\Matrix_loc\bearing_extended.shp'
+    bearing_lines_clip = bearing_clip_fc
+    matrix_extended_line = bearing_extended_fc
 
     try:
         # Create the output shapefile path
         output_folder = os.path.dirname(matrix_extended_line)
         output_name = os.path.basename(matrix_extended_line)
 
+        # Look up the spatial reference once rather than per feature
+        sr = _describe(bearing_lines_clip).spatialReference
+
         # Check if the output shapefile exists, create it if it doesn't
         if not arcpy.Exists(matrix_extended_line):
             arcpy.management.CreateFeatureclass(output_folder,
                                                 output_name,
                                                 "POLYLINE",
-                                                spatial_reference=arcpy.Describe(bearing_lines_clip).spatialReference)
+                                                spatial_reference=sr)
 
             # Add fields to store information
             arcpy.AddField_management(matrix_extended_line, "Id", "LONG")
 
-        # Open an insert cursor to add extended lines
-        with arcpy.da.InsertCursor(matrix_extended_line, ["SHAPE@", "Id"]) as insert_cursor:
-            # Open a search cursor for the input lines shapefile
-            with arcpy.da.SearchCursor(bearing_lines_clip, ["SHAPE@", "Id"]) as search_cursor:
-                for row in search_cursor:
-                    line_geometry, orig_id = row[0], row[1]
+        # Collect the line endpoints first so the trig can run as single
+        # NumPy passes over whole columns instead of per row in Python
+        # The clip output only keeps FIDs now, so track the lines by OID;
+        # footprint attributes get re-joined downstream
+        endpoints = []
+        ids = []
+        with arcpy.da.SearchCursor(bearing_lines_clip, ["SHAPE@", "OID@"]) as search_cursor:
+            for row in search_cursor:
+                line_geometry, orig_id = row[0], row[1]
 
-                    # Get the first and last points of the line
-                    start_point = line_geometry.firstPoint
-                    end_point = line_geometry.lastPoint
+                # Ignore zero-length lines
+                if line_geometry.length == 0:
+                    continue
 
-                    # Calculate new start and end points based on the extension length
-                    # Ignore zero-length lines
-                    if line_geometry.length == 0:
-                        continue
+                start_point = line_geometry.firstPoint
+                end_point = line_geometry.lastPoint
+                endpoints.append((start_point.X, start_point.Y, end_point.X, end_point.Y))
+                ids.append(orig_id)
 
-                    # Calculate the angle of the line
-                    angle = math.atan2(end_point.Y - start_point.Y, end_point.X - start_point.X)
+        if endpoints:
+            sx, sy, ex, ey = np.asarray(endpoints, dtype=np.float64).T
 
-                    # Extend the line in both directions
-                    extended_start_point = arcpy.Point(start_point.X - extension_length * math.cos(angle),
-                                                        start_point.Y - extension_length * math.sin(angle))
-                    extended_end_point = arcpy.Point(end_point.X + extension_length * math.cos(angle),
-                                                        end_point.Y + extension_length * math.sin(angle))
+            # Calculate the angle of each line and the extension offsets
+            angle = np.arctan2(ey - sy, ex - sx)
+            cx = extension_length * np.cos(angle)
+            cy = extension_length * np.sin(angle)
 
-                    # Create a new line geometry with the extended points
-                    extended_line_geometry = arcpy.Polyline(arcpy.Array([extended_start_point, end_point, extended_end_point]),
-                                                            arcpy.Describe(bearing_lines_clip).spatialReference)
+            # Extend the lines in both directions
+            ext_sx, ext_sy = sx - cx, sy - cy
+            ext_ex, ext_ey = ex + cx, ey + cy
 
-                    # Insert the extended line into the output shapefile
-                    insert_cursor.insertRow([extended_line_geometry, orig_id])
+            # Open an insert cursor to add the extended lines
+            with arcpy.da.InsertCursor(matrix_extended_line, ["SHAPE@WKB", "Id"]) as insert_cursor:
+                for i, orig_id in enumerate(ids):
+                    insert_cursor.insertRow([_wkb_line((ext_sx[i], ext_sy[i]),
+                                                       (ex[i], ey[i]),
+                                                       (ext_ex[i], ext_ey[i])), orig_id])
 
         print("Lines extended to matrix plot center.")
 
@@ -243,28 +289,6 @@ def extend_lines(extension_length):
         print(arcpy.GetMessages(2))
 
 
-# A function to assign the original shapefile attributes. Shape 1 is giving the attributes, shape 2 is recieving them
-def intersect_and_transfer_attributes(input_shape1, input_shape2):
-
-    try:
-        # Create a unique temporary output file using the tempfile module
-        temp_dir = tempfile.gettempdir()
-        intersect_output = os.path.join(temp_dir, f"intersect_temp_{next(tempfile._get_candidate_names())}.shp")
-
-        # Intersect point and line features
-        arcpy.analysis.Intersect([input_shape1, input_shape2], intersect_output)
-
-        # Transfer attributes from the intersect result to the line shapefile
-        output_line_shp = input_shape2.replace(".shp", "_att.shp")
-        arcpy.analysis.SpatialJoin(input_shape2, intersect_output, output_line_shp, "JOIN_ONE_TO_ONE", "KEEP_COMMON")
-
-        print("Attributes transferred.")
-
-    except arcpy.ExecuteError:
-        print(arcpy.GetMessages(2))
-
-
-
 # A function to create centerpoints for the matrix location plots
 def create_points_at_line_ends(extended_lines, matrix_loc):
 
@@ -274,34 +298,21 @@ def create_points_at_line_ends(extended_lines, matrix_loc):
         # Set up the workspace
         arcpy.env.workspace = os.path.dirname(matrix_loc)
 
-        # Create the output shapefile
-        arcpy.management.CreateFeatureclass(os.path.dirname(matrix_loc),
-                                            os.path.basename(matrix_loc),
-                                            "POINT",
-                                            spatial_reference=arcpy.Describe(extended_lines).spatialReference)
-
-        # Add fields to store information
-        arcpy.AddField_management(matrix_loc, "Id", "LONG")
-        arcpy.AddField_management(matrix_loc, "End_Type", "TEXT")
+        # Look up the spatial reference once rather than per feature
+        sr = _describe(extended_lines).spatialReference
 
-        # Open an insert cursor to add points at both ends of the lines
-        with arcpy.da.InsertCursor(matrix_loc, ["SHAPE@", "Id", "End_Type"]) as insert_cursor:
-            # Open a search cursor for the input lines shapefile
-            with arcpy.da.SearchCursor(extended_lines, ["SHAPE@", "Id"]) as search_cursor:
-                for row in search_cursor:
-                    line_geometry, orig_id = row[0], row[1]
+        # Gather both end coordinates for every line, then write the whole
+        # point feature class in one call rather than inserting row by row
+        rows = []
+        with arcpy.da.SearchCursor(extended_lines, ["SHAPE@", "Id"]) as search_cursor:
+            for line_geometry, orig_id in search_cursor:
+                start_point = line_geometry.firstPoint
+                end_point = line_geometry.lastPoint
+                rows.append((start_point.X, start_point.Y, orig_id, "Start"))
+                rows.append((end_point.X, end_point.Y, orig_id, "End"))
 
-                    # Get the first and last points of the line
-                    start_point = line_geometry.firstPoint
-                    end_point = line_geometry.lastPoint
-
-                    # Create a point feature at the start of the line
-                    start_point_geometry = arcpy.PointGeometry(start_point, arcpy.Describe(extended_lines).spatialReference)
-                    insert_cursor.insertRow([start_point_geometry, orig_id, "Start"])
-
-                    # Create a point feature at the end of the line
-                    end_point_geometry = arcpy.PointGeometry(end_point, arcpy.Describe(extended_lines).spatialReference)
-                    insert_cursor.insertRow([end_point_geometry, orig_id, "End"])
+        point_arr = np.array(rows, dtype=[("X", "f8"), ("Y", "f8"), ("Id", "i4"), ("End_Type", "U8")])
+        arcpy.da.NumPyArrayToFeatureClass(point_arr, matrix_loc, ["X", "Y"], sr)
 
         print("Points created at both ends of the lines.")
 
@@ -315,31 +326,10 @@ def create_points_at_line_ends(extended_lines, matrix_loc):
 def create_matrix_plots(matrix_loc, output_matrix_plot, plot_radius):
 
     try:
-        # Set up the workspace
-        arcpy.env.workspace = os.path.dirname(output_matrix_plot)
-
-        # Create the output buffer shapefile
-        arcpy.management.CreateFeatureclass(os.path.dirname(output_matrix_plot),
-                                            os.path.basename(output_matrix_plot),
-                                            "POLYGON",
-                                            spatial_reference=arcpy.Describe(matrix_loc).spatialReference)
-
-        # Add fields to store information
-        arcpy.AddField_management(output_matrix_plot, "Id", "LONG")
-        arcpy.AddField_management(output_matrix_plot, "End_Type", "TEXT")
-
-        # Open an insert cursor to add buffer polygons
-        with arcpy.da.InsertCursor(output_matrix_plot, ["SHAPE@", "Id", "End_Type"]) as insert_cursor:
-            # Open a search cursor for the input points shapefile
-            with arcpy.da.SearchCursor(matrix_loc, ["SHAPE@", "Id", "End_Type"]) as search_cursor:
-                for row in search_cursor:
-                    point_geometry, orig_id, end_type = row[0], row[1], row[2]
-
-                    # Create a buffer around the point
-                    buffer_geometry = point_geometry.buffer(plot_radius)
-
-                    # Insert the buffer polygon into the output shapefile
-                    insert_cursor.insertRow([buffer_geometry, orig_id, end_type])
+        # Buffer the whole point feature class in one multi-threaded tool call
+        # instead of buffering point by point from Python. Id and End_Type
+        # carry over from the input automatically
+        arcpy.analysis.PairwiseBuffer(matrix_loc, output_matrix_plot, f"{plot_radius} Meters", dissolve_option="NONE")
 
         print(f"Buffers created and saved here: {output_matrix_plot}")
 
@@ -355,16 +345,14 @@ def add_uniq_ID(input_shapefile):
 
     # Add a field for unique ID
     arcpy.management.AddField(input_shapefile, 'Uni_ID', 'LONG')
-    id_num = 1
 
-    # Iterate over each row in the attribute table to add a unique number
-    with arcpy.da.UpdateCursor(input_shapefile, 'Uni_ID') as cursor:
-        for row in cursor:
-            row[0] = id_num
-            cursor.updateRow(row)
-            id_num += 1
+    # Number the rows 1..N with a single CalculateField call instead of
+    # walking the attribute table from Python with an UpdateCursor
+    arcpy.management.CalculateField(
+        input_shapefile, 'Uni_ID', 'autoIncrement()', 'PYTHON3',
+        code_block='rec = 0\ndef autoIncrement():\n    global rec\n    rec += 1\n    return rec'
+    )
 
-    del cursor
     print('Unique IDs added')
 
 
@@ -375,49 +363,28 @@ def add_uniq_ID(input_shapefile):
 # They can be adjusted as necessary
 def create_wellpad_matrix_ring_buffer(input_shapefile):
 
-    output_folder = folder_loc + r'\Wellpad_matrix_loc'
-
-    # Create the output folder if it does not exist
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
+    out_feature_class = work_gdb + r'\wellpads_matrix_ring'
+
+    # Build both rings in a single buffer pass. With OUTSIDE_ONLY ring
+    # polygons the 26 m ring already excludes everything inside 24 m, so the
+    # two separate buffer shapefiles and the overlay erase are not needed.
+    ring_buffers = r'memory\wellpad_rings'
+    arcpy.analysis.MultipleRingBuffer(
+        Input_Features = input_shapefile,
+        Output_Feature_class = ring_buffers,
+        Distances = [24, 26],
+        Buffer_Unit = 'Meters',
+        Dissolve_Option = 'NONE',
+        Outside_Polygons_Only = 'OUTSIDE_ONLY'
+    )
+    print('Ring buffers completed')
 
-    out_feature_class = output_folder +  r'\wellpads_matrix_ring.shp'
+    # Keep only the 24-26 m band around each pad
+    arcpy.management.MakeFeatureLayer(ring_buffers, 'ring_layer', '"distance" = 26')
+    arcpy.management.CopyFeatures('ring_layer', out_feature_class)
+    arcpy.management.Delete('ring_layer')
+    arcpy.management.Delete(ring_buffers)
 
-    # Create the buffer closest to the wellpad
-    arcpy.analysis.Buffer(
-        in_features = input_shapefile,
-        out_feature_class = output_folder + r'\wellpads_24.shp',
-        buffer_distance_or_field ='24 Meters',
-        line_side = 'OUTSIDE_ONLY',
-        line_end_type = 'ROUND',
-        dissolve_option ='NONE',
-        dissolve_field = None,
-        method = 'PLANAR'
-    )
-    print('Inner buffer completed')
-
-    # Create the buffer furthest from the wellapd
-    arcpy.analysis.Buffer(
-        in_features = input_shapefile,
-        out_feature_class= output_folder + r'\wellpads_26.shp',
-        buffer_distance_or_field='26 Meters',
-        line_side = 'OUTSIDE_ONLY',
-        line_end_type = 'ROUND',
-        dissolve_option = 'NONE',
-        dissolve_field = None,
-        method = 'PLANAR'
-    )
-    print('Outer buffer completed')
-
-    # Use the overlay tool to get the difference between the two layers
-    arcpy.gapro.OverlayLayers(
-    # The input_layer is the shapefile that is furthest away from the edge of the pad
-    input_layer = output_folder + r'\wellpads_26.shp',
-    overlay_layer = output_folder + r'\wellpads_24.shp',
-    out_feature_class = out_feature_class,
-    overlay_type ='ERASE'
-    )
     print(f'Wellpad matrix ring completed and saved to {out_feature_class}')
 
 
@@ -425,7 +392,7 @@ def create_wellpad_matrix_ring_buffer(input_shapefile):
 ### This uses the original point file that the wellpad plots were generated from
 def create_wellpad_mx_lines(input_point_shp):
 
-    bearing_line = os.path.join(folder_loc, "Wellpad_matrix_loc", "SHL_mx_lines.shp")
+    bearing_line = work_gdb + r'\SHL_mx_lines'
 
     # Set a line length that will extend from the center of the wellpad and into the matrix at arpproximately the desired distance
     # Wellpads can be in many orientations, so the distance into the matrix will be different for different pads
@@ -435,36 +402,29 @@ def create_wellpad_mx_lines(input_point_shp):
     arcpy.env.workspace = os.path.dirname(bearing_line)
 
     # Get the spatial reference from the input point shapefile
-    spatial_reference = arcpy.Describe(input_point_shp).spatialReference
+    spatial_reference = _describe(input_point_shp).spatialReference
 
     # Create a new line feature class with the same spatial reference as the input point shapefile
     arcpy.management.CreateFeatureclass(os.path.dirname(bearing_line), os.path.basename(bearing_line), "POLYLINE", spatial_reference=spatial_reference)
 
-    # Insert line features for each point in the input shapefile
-    with arcpy.da.SearchCursor(input_point_shp, ["SHAPE@"]) as search_cursor:
-        with arcpy.da.InsertCursor(bearing_line, ["SHAPE@"]) as insert_cursor:
-            for row in search_cursor:
-                try:
-                    # Extract the point geometry
-                    point_geometry = row[0]
-
-                    # Create the line features in all four cardinal directions
-                    start_point_ew = arcpy.Point(point_geometry.centroid.X - length, point_geometry.centroid.Y)
-                    end_point_ew = arcpy.Point(point_geometry.centroid.X + length, point_geometry.centroid.Y)
-                    array_ew = arcpy.Array([start_point_ew, end_point_ew])
-                    line_geometry_ew = arcpy.Polyline(array_ew)
-                    insert_cursor.insertRow([line_geometry_ew])
-
-                    start_point_ns = arcpy.Point(point_geometry.centroid.X, point_geometry.centroid.Y - length)
-                    end_point_ns = arcpy.Point(point_geometry.centroid.X, point_geometry.centroid.Y + length)
-                    array_ns = arcpy.Array([start_point_ns, end_point_ns])
-                    line_geometry_ns = arcpy.Polyline(array_ns)
-                    insert_cursor.insertRow([line_geometry_ns])
+    # Shapefiles always had an implicit Id field but GDB feature classes only
+    # get OBJECTID, and create_points_at_line_ends reads Id downstream
+    arcpy.AddField_management(bearing_line, "Id", "LONG")
 
+    # Read every pad centroid at once and precompute the endpoint arrays with
+    # NumPy, so the insert loop only has to build the two line geometries per pad
+    arr = arcpy.da.FeatureClassToNumPyArray(input_point_shp, ["SHAPE@XY"])
+    xs = arr["SHAPE@XY"][:, 0]
+    ys = arr["SHAPE@XY"][:, 1]
 
+    ew_sx, ew_ex = xs - length, xs + length
+    ns_sy, ns_ey = ys - length, ys + length
 
-                except Exception as e:
-                    print(f"Error processing point: {e}")
+    # Insert the line features in both cardinal directions for each pad
+    with arcpy.da.InsertCursor(bearing_line, ["SHAPE@WKB", "Id"]) as insert_cursor:
+        for i in range(len(arr)):
+            insert_cursor.insertRow([_wkb_line((ew_sx[i], ys[i]), (ew_ex[i], ys[i])), 2 * i])
+            insert_cursor.insertRow([_wkb_line((xs[i], ns_sy[i]), (xs[i], ns_ey[i])), 2 * i + 1])
 
     print(f"Bearing shapefile created at: {bearing_line}")
 
@@ -472,7 +432,15 @@ def create_wellpad_mx_lines(input_point_shp):
 
 ## Run the create_points_at_line_ends function and the create_matrix_plots from the lines code to generate the points at line ends before moving onto the next function.
 
+# A function to assign the original shapefile attributes. Shape 1 is giving the attributes, shape 2 is recieving them
 def intersect_and_transfer_attributes(input_shape1, input_shape2):
+
+    # Memory feature classes have no extension, so append the suffix instead
+    if input_shape2.endswith(".shp"):
+        output_line_shp = input_shape2.replace(".shp", "_att.shp")
+    else:
+        output_line_shp = input_shape2 + "_att"
+
     try:
         # Create a unique temporary output file using the tempfile module
         temp_dir = tempfile.gettempdir()
@@ -487,7 +455,6 @@ def intersect_and_transfer_attributes(input_shape1, input_shape2):
             return
 
         # Transfer attributes from the intersect result to the line shapefile
-        output_line_shp = input_shape2.replace(".shp", "_att.shp")
         arcpy.analysis.SpatialJoin(input_shape2, intersect_output, output_line_shp, "JOIN_ONE_TO_ONE", "KEEP_COMMON")
 
         print("Attributes transferred.")
@@ -508,36 +475,63 @@ spatial_reference=arcpy.SpatialReference(26912)
 input_pad_shp = r'C:\BERA\00_Footprints_creation\Lines\Sur_ranpad_100m_proj.shp'
 input_pad_pt = r'C:\BERA\00_Footprints_creation\Samples\Working_Files\SHL_RanSamp_comb\Rand_SHL_comb.shp'
 
+# Intermediates of the line matrix pipeline are held in the memory workspace;
+# only the final matrix plots are written to disk
+matrix_bearing_fc = r'memory\matrix_bearing'
+bearing_clip_fc = r'memory\bearing_clip'
+bearing_extended_fc = r'memory\bearing_extended'
+matrix_loc_fc = r'memory\matrix_loc'
 
+# File geodatabase holding the wellpad pipeline intermediates
+work_gdb = folder_loc + r'\work.gdb'
 
 
 
-setup_folders(folder_loc)
-
 
 
  # Line matrix plot creation
-calculate_polygon_center()
-create_point_shapefile()
-create_bearing_lines()
-bearing_clip_footprint()
-extend_lines(25)
-intersect_and_transfer_attributes((folder_loc + r'\Line_midpoint\Centroid_Points.shp'), (folder_loc + r'\Matrix_loc\bearing_extended.shp'))
-create_points_at_line_ends(folder_loc + r'\Matrix_loc\bearing_extended_att.shp', folder_loc + r'\Matrix_loc\matrix_loc.shp')
-create_matrix_plots(folder_loc + r'\Matrix_loc\matrix_loc.shp', folder_loc + r'\Matrix_plots\matrix_plot.shp', 5.642)
-intersect_and_transfer_attributes
-intersect_and_transfer_attributes((folder_loc + r'\Matrix_loc\bearing_extended_att.shp'), (folder_loc + r'\Matrix_plots\matrix_plot.shp'))
+def run_lines():
+    # Give this process its own scratch workspace so the two pipelines
+    # don't contend for locks on intermediates
+    arcpy.env.scratchWorkspace = tempfile.mkdtemp()
+    # Runs the centroid stages over FID tiles in worker processes and merges
+    # the results into the Centroid_Points shapefile the next stage reads
+    run_tiled_centroids()
+    create_bearing_lines()
+    bearing_clip_footprint()
+    extend_lines(25)
+    intersect_and_transfer_attributes((folder_loc + r'\Line_midpoint\Centroid_Points.shp'), bearing_extended_fc)
+    create_points_at_line_ends(bearing_extended_fc + '_att', matrix_loc_fc)
+    create_matrix_plots(matrix_loc_fc, folder_loc + r'\Matrix_plots\matrix_plot.shp', 5.642)
+    intersect_and_transfer_attributes((bearing_extended_fc + '_att'), (folder_loc + r'\Matrix_plots\matrix_plot.shp'))
 
 
 
  # Wellpad matrix plot creation
-add_uniq_ID(input_pad_shp)
-create_wellpad_matrix_ring_buffer(input_pad_shp)
-create_wellpad_mx_lines(input_pad_pt)
-intersect_and_transfer_attributes (input_pad_shp, folder_loc + r'\Wellpad_matrix_loc\SHL_mx_lines.shp')
-create_points_at_line_ends(folder_loc + r'\Wellpad_matrix_loc\SHL_mx_lines_att.shp', folder_loc + r'\Wellpad_matrix_loc\SHL_matrix_loc.shp')
-create_matrix_plots(folder_loc + r'\Wellpad_matrix_loc\SHL_matrix_loc.shp', folder_loc + r'\Wellpad_plots\SHL_matrix_plot_32612.shp', 5.642)
-intersect_and_transfer_attributes(folder_loc + r'\Wellpad_matrix_loc\SHL_mx_lines_att.shp', folder_loc + r'\Wellpad_plots\SHL_matrix_plot_32612.shp' )
+def run_pads():
+    arcpy.env.scratchWorkspace = tempfile.mkdtemp()
+    add_uniq_ID(input_pad_shp)
+    create_wellpad_matrix_ring_buffer(input_pad_shp)
+    create_wellpad_mx_lines(input_pad_pt)
+    intersect_and_transfer_attributes (input_pad_shp, work_gdb + r'\SHL_mx_lines')
+    create_points_at_line_ends(work_gdb + r'\SHL_mx_lines_att', work_gdb + r'\SHL_matrix_loc')
+    create_matrix_plots(work_gdb + r'\SHL_matrix_loc', folder_loc + r'\Wellpad_plots\SHL_matrix_plot_32612.shp', 5.642)
+    intersect_and_transfer_attributes(work_gdb + r'\SHL_mx_lines_att', folder_loc + r'\Wellpad_plots\SHL_matrix_plot_32612.shp' )
+
+
+
+# The two pipelines share no inputs or outputs, so run them in parallel
+# processes. The __main__ guard keeps worker processes from re-running the
+# pipelines when they import this module
+if __name__ == '__main__':
+    setup_folders(folder_loc)
+
+    line_proc = Process(target=run_lines)
+    pad_proc = Process(target=run_pads)
+    line_proc.start()
+    pad_proc.start()
+    line_proc.join()
+    pad_proc.join()
 
 
 